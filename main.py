@@ -1,17 +1,15 @@
 import os
 import argparse
-import configparser
+import functools
+import stat
 import sys
-import hashlib
-import tarfile
-import zstandard as zstd
-import time
 from datetime import datetime
 from pathlib import Path
 
 yabs_version = "0.1.0"
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_config_path():
     xdg_config_home = os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
     return os.path.join(xdg_config_home, "yabs", "config.ini")
@@ -29,17 +27,65 @@ def load_config(config_path=None):
         print(f"Error: Configuration file '{config_path}' not found.")
         sys.exit(1)
 
-    config = configparser.ConfigParser()
-    config.read(config_path)
+    config = _fast_load(config_path)
+    if config is None:
+        import configparser
+
+        config = configparser.ConfigParser()
+        config.read(config_path)
+    return config
+
+
+def _fast_load(config_path):
+    """Parse a plain INI file into a dict of sections.
+
+    Returns None when the file uses anything beyond "[section]" headers,
+    full-line comments and "key = value" pairs, so the caller can fall back
+    to configparser.
+    """
+    config = {}
+    section = None
+    with open(config_path) as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            if line[0].isspace():
+                # Continuation lines need configparser
+                return None
+            if stripped[0] == "[":
+                name = stripped[1:-1]
+                if stripped[-1] != "]" or name in config or name == "DEFAULT":
+                    return None
+                section = config[name] = {}
+                continue
+            key, sep, value = stripped.partition("=")
+            key = key.strip().lower()
+            if section is None or not sep or not key or ":" in key or "%" in value:
+                return None
+            if key in section:
+                return None
+            section[key] = value.strip()
     return config
 
 
 def validate_directory(directory, should_exist=True):
     if should_exist:
-        if not os.path.isdir(directory):
+        try:
+            is_dir = stat.S_ISDIR(os.stat(directory).st_mode)
+        except OSError:
+            is_dir = False
+        if not is_dir:
             print(f"Error: Directory '{directory}' does not exist.")
             return False
     else:
+        return ensure_dirs([directory])
+    return True
+
+
+def ensure_dirs(directories):
+    # Create each distinct directory once; sorting puts parents before children
+    for directory in sorted(set(directories)):
         try:
             os.makedirs(directory, exist_ok=True)
         except PermissionError:
@@ -49,11 +95,8 @@ def validate_directory(directory, should_exist=True):
 
 
 def validate_read_access(directory):
-    try:
-        # Attempt to list contents to check read access
-        if os.listdir(directory) is None:
-            raise PermissionError
-    except (PermissionError, FileNotFoundError):
+    # Check the permission bits directly rather than listing the contents
+    if not os.access(directory, os.R_OK | os.X_OK):
         print(f"Error: No read access to directory '{directory}'.")
         return False
     return True
@@ -65,6 +108,8 @@ def get_input(prompt, default_value=None):
 
 
 def init():
+    import configparser
+
     print("Configuration File Generator")
 
     # Determine the default save location
@@ -73,14 +118,12 @@ def init():
         "Enter the path to save the configuration file", default_save_location
     )
 
-    # Validate and create the parent directory if needed
-    save_dir = os.path.dirname(save_path)
-    if not validate_directory(save_dir, should_exist=False):
-        sys.exit(1)
-
     # Collect backup destination
     backup_destination = get_input("Enter the backup destination directory")
-    if not validate_directory(backup_destination, should_exist=False):
+
+    # Create the config file's parent directory and the destination if needed
+    save_dir = os.path.dirname(save_path)
+    if not ensure_dirs([save_dir, backup_destination]):
         sys.exit(1)
 
     # Collect list of directories to back up
@@ -128,41 +171,190 @@ def init():
 
 
 def backup(args):
+    # Imported here so other subcommands don't pay for the process pool
+    from concurrent.futures import ProcessPoolExecutor
+
     # Load configuration
     config = load_config(args.config)
-    directories = config.get("backup", "directories").split(",")
-    destination = config.get("backup", "destination")
+    directories = config["backup"]["directories"].split(",")
+    destination = config["backup"]["destination"]
     retention_policy = {
-        "days": int(config.get("backup", "days")),
-        "weeks": int(config.get("backup", "weeks")),
-        "months": int(config.get("backup", "months")),
-        "years": int(config.get("backup", "years")),
+        "days": int(config["backup"]["days"]),
+        "weeks": int(config["backup"]["weeks"]),
+        "months": int(config["backup"]["months"]),
+        "years": int(config["backup"]["years"]),
     }
 
     # Determine backup category
     backup_category = determine_backup_category(retention_policy)
 
-    # Create a compressed archive
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    archive_name = f"backup-{timestamp}.tar.zst"  # Example using zstandard
-    archive_path = os.path.join(destination, backup_category, archive_name)
-
     # Ensure the destination directory exists
-    os.makedirs(os.path.dirname(archive_path), exist_ok=True)
-
-    # Use zstandard compression for the archive
-    cctx = zstd.ZstdCompressor()
-    with open(archive_path, "wb") as f:
-        with cctx.stream_writer(f) as compressed_file:
-            with tarfile.open(fileobj=compressed_file, mode="w") as tar:
-                for directory in directories:
-                    tar.add(directory, arcname=os.path.basename(directory))
-
-    # Generate SHA-256 hashes and update metadata
-    sha256_hash = generate_sha256(archive_path)
-    update_metadata(destination, backup_category, archive_name, sha256_hash)
-
-    print(f"Backup created and stored in {archive_path}")
+    category_path = os.path.join(destination, backup_category)
+    os.makedirs(category_path, exist_ok=True)
+
+    # Create one compressed archive per source directory, numbering the parts
+    # when there is more than one (zero-padded so they list in order)
+    timestamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+    if len(directories) == 1:
+        archive_names = [f"backup-{timestamp}.tar.zst"]
+    else:
+        archive_names = [
+            f"backup-{timestamp}.part{index:02d}.tar.zst"
+            for index in range(len(directories))
+        ]
+    archive_paths = [os.path.join(category_path, name) for name in archive_names]
+
+    # Archive the directories in parallel processes, sharing the CPUs out
+    # between their zstandard worker threads
+    cpu_count = os.cpu_count() or 1
+    workers = min(len(directories), cpu_count)
+    threads = max(1, cpu_count // workers)
+    if workers == 1:
+        sha256_hashes = []
+        try:
+            for archive_path, directory in zip(archive_paths, directories):
+                sha256_hashes.append(write_archive(archive_path, directory, threads))
+        except BaseException:
+            remove_archives(archive_paths[: len(sha256_hashes)])
+            raise
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(write_archive, archive_path, directory, threads)
+                for archive_path, directory in zip(archive_paths, directories)
+            ]
+        # Leaving the with block waits for every part, so all results are in
+        errors = [future.exception() for future in futures]
+        if any(errors):
+            remove_archives(
+                [path for path, error in zip(archive_paths, errors) if error is None]
+            )
+            raise next(error for error in errors if error)
+        sha256_hashes = [future.result() for future in futures]
+
+    # Record the SHA-256 hashes in the metadata. Each part gets its own line,
+    # but the parts sharing a backup-<timestamp> prefix form a single backup
+    # and must be kept or pruned together
+    for archive_name, archive_path, sha256_hash in zip(
+        archive_names, archive_paths, sha256_hashes
+    ):
+        update_metadata(destination, backup_category, archive_name, sha256_hash)
+        print(f"Backup created and stored in {archive_path}")
+
+
+def remove_archives(archive_paths):
+    # A backup missing some of its parts is useless and would never get a
+    # metadata line, so remove the parts this run did finish
+    for archive_path in archive_paths:
+        os.remove(archive_path)
+
+
+def write_archive(archive_path, directory, threads):
+    """Write a directory to a zstd-compressed tar and return its SHA-256 hash."""
+    import tarfile
+    import zstandard as zstd
+
+    # Use multi-threaded zstandard compression for the archive, fed by a
+    # sequential tar stream that reads and writes in large blocks to cut
+    # per-call overhead
+    cctx = zstd.ZstdCompressor(level=3, threads=threads)
+    # Exclusive creation fails on a name clash instead of truncating an
+    # existing archive from a backup started in the same second
+    with open(archive_path, "xb") as f:
+        try:
+            # Hash the compressed bytes on their way to disk instead of re-reading
+            hashing_writer = HashingWriter(f)
+            with cctx.stream_writer(hashing_writer) as compressed_file:
+                with tarfile.open(
+                    fileobj=compressed_file,
+                    mode="w|",
+                    bufsize=1024 * 1024,
+                    copybufsize=1024 * 1024,
+                ) as tar:
+                    add_directory(tar, directory, os.path.basename(directory))
+        except BaseException:
+            # Don't leave a truncated archive behind
+            os.remove(archive_path)
+            raise
+    return hashing_writer.sha256.hexdigest()
+
+
+def add_directory(tar, directory, arcname):
+    """Add a directory tree to a tar archive, walking it with os.scandir."""
+    import grp
+    import pwd
+    import tarfile
+
+    # Owner and group names are resolved once per id rather than once per file
+    user_names = {}
+    group_names = {}
+
+    def lookup_name(names, lookup, key):
+        if key not in names:
+            try:
+                names[key] = lookup(key)[0]
+            except KeyError:
+                names[key] = ""
+        return names[key]
+
+    def add_entry(path, name, entry_stat):
+        mode = entry_stat.st_mode
+        if stat.S_ISDIR(mode):
+            member_type = tarfile.DIRTYPE
+        elif stat.S_ISREG(mode) and entry_stat.st_nlink == 1:
+            member_type = tarfile.REGTYPE
+        else:
+            # Leave symlinks, hard links and special files to tarfile
+            tar.add(path, arcname=name, recursive=False)
+            return
+
+        # Build the member from the stat result we already have instead of
+        # letting tarfile lstat the path again
+        tarinfo = tar.tarinfo(name.lstrip("/"))
+        tarinfo.type = member_type
+        tarinfo.mode = stat.S_IMODE(mode)
+        tarinfo.uid = entry_stat.st_uid
+        tarinfo.gid = entry_stat.st_gid
+        tarinfo.uname = lookup_name(user_names, pwd.getpwuid, entry_stat.st_uid)
+        tarinfo.gname = lookup_name(group_names, grp.getgrgid, entry_stat.st_gid)
+        tarinfo.mtime = entry_stat.st_mtime
+        if member_type == tarfile.REGTYPE:
+            tarinfo.size = entry_stat.st_size
+            with open(path, "rb") as f:
+                tar.addfile(tarinfo, f)
+        else:
+            tar.addfile(tarinfo)
+
+    def add_tree(path, name):
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            entry_name = f"{name}/{entry.name}"
+            add_entry(entry.path, entry_name, entry.stat(follow_symlinks=False))
+            if entry.is_dir(follow_symlinks=False):
+                add_tree(entry.path, entry_name)
+
+    root_stat = os.lstat(directory)
+    add_entry(directory, arcname, root_stat)
+    if stat.S_ISDIR(root_stat.st_mode):
+        add_tree(directory, arcname)
+
+
+class HashingWriter:
+    """File wrapper that updates a SHA-256 hash with every byte written."""
+
+    def __init__(self, f):
+        import hashlib
+
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
 
 
 def determine_backup_category(retention_policy):
@@ -180,17 +372,31 @@ def determine_backup_category(retention_policy):
 
 
 def generate_sha256(file_path):
-    sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256.update(byte_block)
-    return sha256.hexdigest()
+    import hashlib
+    import mmap
+
+    with open(file_path, "rb", buffering=0) as f:
+        # mmap can't map empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        # Hash straight out of the page cache instead of copying into buffers
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return hashlib.sha256(mm).hexdigest()
 
 
 def update_metadata(destination, category, archive_name, sha256_hash):
     metadata_file = os.path.join(destination, category, "metadata.txt")
-    with open(metadata_file, "a") as f:
-        f.write(f"{archive_name} {sha256_hash}\n")
+    # A single O_APPEND write keeps concurrent backups from interleaving lines
+    line = f"{archive_name} {sha256_hash}\n".encode()
+    fd = os.open(
+        metadata_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644
+    )
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
 
 
 # priority 3
@@ -205,41 +411,49 @@ def list_backups(args):
     # Load configuration
     config = load_config(args.config)
     backup_categories = ["daily", "weekly", "monthly", "yearly"]
-    base_path = config.get("backup", "destination")
+    base_path = config["backup"]["destination"]
 
     # Function to read the metadata file and return a set of valid backup filenames
     def load_metadata(category_path):
         metadata_file = os.path.join(category_path, "metadata.txt")
-        valid_files = set()
-        if os.path.isfile(metadata_file):
-            with open(metadata_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        parts = line.split()
-                        if parts:
-                            valid_files.add(parts[0])  # Only add the filename
-        return valid_files
+        try:
+            with open(
+                metadata_file, "r", encoding="utf-8", buffering=1024 * 1024
+            ) as f:
+                # Only keep the filename, the first whitespace-separated field
+                return {line.split(None, 1)[0] for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
 
     for category in backup_categories:
         category_path = os.path.join(base_path, category)
-        if os.path.isdir(category_path):
-            # Load valid backup filenames from metadata
-            valid_files = load_metadata(category_path)
-
-            print(f"\n{category.capitalize()} Backups:")
-            for filename in sorted(os.listdir(category_path), reverse=True):
-                file_path = os.path.join(category_path, filename)
-                if (
-                    os.path.isfile(file_path)
-                    and filename in valid_files
-                    and filename != "metadata.txt"
-                ):
-                    file_size = os.path.getsize(file_path)
-                    human_size = human_readable_size(file_size)
-                    timestamp = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    formatted_date = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    print(f"{filename} - Size: {human_size} - Date: {formatted_date}")
+        # A single scandir pass checks the category exists, serves the file
+        # type from the directory listing and caches each entry's stat result
+        try:
+            with os.scandir(category_path) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        # Load valid backup filenames from metadata
+        valid_files = load_metadata(category_path)
+        backups = [
+            entry
+            for entry in entries
+            if entry.name in valid_files
+            and entry.name != "metadata.txt"
+            and entry.is_file()
+        ]
+        backups.sort(key=lambda entry: entry.name, reverse=True)
+
+        print(f"\n{category.capitalize()} Backups:")
+        for entry in backups:
+            # Size and date both come from the one cached stat result
+            entry_stat = entry.stat()
+            human_size = human_readable_size(entry_stat.st_size)
+            timestamp = datetime.fromtimestamp(entry_stat.st_mtime)
+            formatted_date = timestamp.isoformat(sep=" ", timespec="seconds")
+            print(f"{entry.name} - Size: {human_size} - Date: {formatted_date}")
 
 
 def human_readable_size(size):
@@ -285,7 +499,8 @@ def help(parser):
     exit()
 
 
-def parse_arguments():
+@functools.lru_cache(maxsize=1)
+def _build_parser():
     parser = argparse.ArgumentParser(description="Yet Another Backup Script")
     parser.add_argument("--config", help="Path to the configuration file", default=None)
     subparsers = parser.add_subparsers(dest="command")
@@ -350,6 +565,11 @@ def parse_arguments():
         "help", help="Show the arguments and usage info for the yabs command"
     )
 
+    return parser
+
+
+def parse_arguments():
+    parser = _build_parser()
     return parser.parse_args(), parser
 
 
@@ -386,28 +606,23 @@ def print_usage(parser):
 def main():
     args, parser = parse_arguments()
 
-    if args.command == "init":
-        init()
-    elif args.command == "backup":
-        backup(args)
-    elif args.command == "restore":
-        restore(args)
-    elif args.command == "ls":
-        list_backups(args)
-    elif args.command == "prune":
-        prune(args)
-    elif args.command == "validate":
-        validate(args)
-    elif args.command == "status":
-        status(args)
-    elif args.command == "version":
-        version()
-    elif args.command == "help":
-        help(parser)
-    else:
+    commands = {
+        "init": lambda args: init(),
+        "backup": backup,
+        "restore": restore,
+        "ls": list_backups,
+        "prune": prune,
+        "validate": validate,
+        "status": status,
+        "version": lambda args: version(),
+        "help": lambda args: help(parser),
+    }
+    command = commands.get(args.command)
+    if command is None:
         print("Error: No command provided.")
         print_usage(parser)
         sys.exit(1)
+    command(args)
 
 
 if __name__ == "__main__":